@@ -4,7 +4,9 @@ import sqlite3
 import os 
 import re 
 import mlb_api 
+from db_setup import MATCHUP_YEAR_INDEX_SQL 
 import unicodedata 
+from functools import lru_cache 
 
 DB_PATH =os .path .join (os .path .dirname (__file__ ),'baseball_stats.db')
 
@@ -28,12 +30,55 @@ STAT_MAPPING_PITCHER ={
 'bb9':'bb9','so9':'so9','so_bb':'so_w'
 }
 
+NAME_MARKER_TABLE =str .maketrans ('','','*#+')
+
+MULTI_TEAM_CODES =frozenset ({'2TM','3TM','4TM','5TM'})
+
+OHTANI_ID ='ohtansh01'
+
+TABLE_COLUMNS ={}
+
+STAT_LABEL_ALIASES ={
+'w-l%':('w_l_pct','W-L%'),
+'so/bb':('so_bb','SO/BB'),
+'era+':('era_plus','ERA+'),
+'ops+':('ops_plus','OPS+'),
+'rbat+':('rbat_plus','Rbat+'),
+'2b':('doubles','2B'),
+'3b':('triples','3B'),
+'h/9':('h9','H/9'),
+'hr/9':('hr9','HR/9'),
+'bb/9':('bb9','BB/9'),
+'so/9':('so9','SO/9'),
+}
+
+@lru_cache ()
 def get_db_connection ():
-    """Get database connection to baseball stats database"""
-    return sqlite3 .connect (DB_PATH )
+    """Get database connection to baseball stats database
 
+    The connection is opened once per process and shared by every caller.
+    The matchup sort index is added here since the shipped database predates
+    it; a read-only database is used without it.
+    """
+    conn =sqlite3 .connect (DB_PATH ,check_same_thread =False ,cached_statements =256 )
+    conn .execute ('PRAGMA mmap_size=268435456')
+    conn .execute ('PRAGMA cache_size=-65536')
+    try :
+        conn .execute (MATCHUP_YEAR_INDEX_SQL )
+        conn .commit ()
+    except sqlite3 .OperationalError :
+        pass 
+    return conn 
+
+@lru_cache (maxsize =None )
 def remove_accents (text ):
-    """Remove accents from unicode string"""
+    """Remove accents from unicode string
+
+    Results are memoized since the same player names are folded on every
+    search; plain ASCII names are returned unchanged.
+    """
+    if text .isascii ():
+        return text 
     nfd =unicodedata .normalize ('NFD',text )
     return ''.join (char for char in nfd if unicodedata .category (char )!='Mn')
 
@@ -69,8 +114,7 @@ def find_player (cursor ,name_query ):
     cursor .execute ('SELECT * FROM pitcher_stats WHERE ip >= 5 ORDER BY year ASC, team')
     all_pitchers =cursor .fetchall ()
 
-    cursor .execute (f"SELECT * FROM pitcher_stats LIMIT 1")
-    column_names =[desc [0 ]for desc in cursor .description ]
+    column_names =get_column_names (cursor ,'pitcher')
     player_col_idx =column_names .index ('player')
 
     pitcher_matches =[]
@@ -86,8 +130,7 @@ def find_player (cursor ,name_query ):
     cursor .execute ('SELECT * FROM hitter_stats WHERE ab >= 5 ORDER BY year ASC, team')
     all_hitters =cursor .fetchall ()
 
-    cursor .execute (f"SELECT * FROM hitter_stats LIMIT 1")
-    column_names =[desc [0 ]for desc in cursor .description ]
+    column_names =get_column_names (cursor ,'hitter')
     player_col_idx =column_names .index ('player')
 
     hitter_matches =[]
@@ -221,18 +264,15 @@ def parse_awards (awards_str ):
 
     return ', '.join (awards )if awards else awards_str 
 
-def get_column_index (cursor ,column_name ):
-    """Get the index of a column name from cursor description"""
-    column_names =[desc [0 ]for desc in cursor .description ]
-    try :
-        return column_names .index (column_name )
-    except ValueError :
-        return None 
-
 def get_column_names (cursor ,table_name ):
-    """Get column names for a table"""
-    cursor .execute (f"SELECT * FROM {table_name}_stats LIMIT 1")
-    return [desc [0 ]for desc in cursor .description ]
+    """Get column names for a table
+
+    Column lists are cached per table for the life of the process.
+    """
+    if table_name not in TABLE_COLUMNS :
+        cursor .execute (f"SELECT * FROM {table_name}_stats LIMIT 1")
+        TABLE_COLUMNS [table_name ]=[desc [0 ]for desc in cursor .description ]
+    return TABLE_COLUMNS [table_name ]
 
 def parse_year_filter (year ):
     """Parse year string and return integer year, or None if invalid"""
@@ -253,22 +293,9 @@ def normalize_stat_label (stat ):
     """
     stat_lower =stat .lower ()
 
-    special_mappings ={
-    'w-l%':('w_l_pct','W-L%'),
-    'so/bb':('so_bb','SO/BB'),
-    'era+':('era_plus','ERA+'),
-    'ops+':('ops_plus','OPS+'),
-    'rbat+':('rbat_plus','Rbat+'),
-    '2b':('doubles','2B'),
-    '3b':('triples','3B'),
-    'h/9':('h9','H/9'),
-    'hr/9':('hr9','HR/9'),
-    'bb/9':('bb9','BB/9'),
-    'so/9':('so9','SO/9'),
-    }
-
-    if stat_lower in special_mappings :
-        return special_mappings [stat_lower ]
+    special_mapping =STAT_LABEL_ALIASES .get (stat_lower )
+    if special_mapping :
+        return special_mapping 
 
     stat_key =stat_lower .replace ('-','_').replace ('/','_')
     stat_label =stat .upper ()
@@ -290,24 +317,24 @@ def get_player_team_info (matches ,column_names ):
     season_2025 =[m for m in matches if m [year_col_idx ]==2025 ]
 
     if season_2025 :
-        teams =[m [team_col_idx ]for m in season_2025 if '2TM'not in m [team_col_idx ]and '3TM'not in m [team_col_idx ]]
+        teams =[m [team_col_idx ]for m in season_2025 if m [team_col_idx ]not in MULTI_TEAM_CODES ]
         if not teams :
             teams =[season_2025 [0 ][team_col_idx ]]
     else :
 
         most_recent_year =max (m [year_col_idx ]for m in matches )
         recent_matches =[m for m in matches if m [year_col_idx ]==most_recent_year ]
-        teams =[m [team_col_idx ]for m in recent_matches if '2TM'not in m [team_col_idx ]and '3TM'not in m [team_col_idx ]]
+        teams =[m [team_col_idx ]for m in recent_matches if m [team_col_idx ]not in MULTI_TEAM_CODES ]
         if not teams :
             teams =[recent_matches [0 ][team_col_idx ]]
 
     return ', '.join (teams )if len (teams )>1 else teams [0 ]
 
-def is_ohtani (player_name ):
-    """Check if player is Shohei Ohtani"""
-    normalized_name =re .sub (r'[*#+]','',player_name ).strip ().lower ()
-    return 'shohei ohtani'in normalized_name 
+def is_ohtani (player_id ):
+    """Check if player is Shohei Ohtani, by Baseball Reference player id"""
+    return player_id ==OHTANI_ID 
 
+@lru_cache (maxsize =None )
 def get_stat_category (stat_key ):
     """Returns 'pitcher', 'hitter', or 'common' for a given stat key"""
     pitcher_only_stats ={
@@ -373,13 +400,34 @@ def list_matching_players (cursor ,matches ,player_type ):
     column_names =get_column_names (cursor ,player_type )
     player_col_idx =column_names .index ('player')
 
-    unique_players =set (match [player_col_idx ]for match in matches )
+    matches_by_name ={}
+    for match in matches :
+        matches_by_name .setdefault (match [player_col_idx ],[]).append (match )
 
-    for player in sorted (unique_players ):
-        player_matches =[match for match in matches if match [player_col_idx ]==player ]
+    for player ,player_matches in sorted (matches_by_name .items ()):
         team_info =get_player_team_info (player_matches ,column_names )
         click .echo (f"  - {player} ({team_info})")
 
+def build_player_choices (cursor ,matches ,player_type ):
+    """Build selectable (name, player_type, team_str, matches) choices for each player name
+
+    Names are compared with their *, # and + markers stripped.
+    """
+    column_names =get_column_names (cursor ,player_type )
+    player_col_idx =column_names .index ('player')
+
+    matches_by_name ={}
+    for match in matches :
+        name =match [player_col_idx ].translate (NAME_MARKER_TABLE ).strip ()
+        matches_by_name .setdefault (name ,[]).append (match )
+
+    choices =[]
+    for player ,player_matches in sorted (matches_by_name .items ()):
+        team_str =get_player_team_info (player_matches ,column_names )
+        choices .append ((player ,player_type ,team_str ,player_matches ))
+
+    return choices 
+
 def render_player (cursor ,matches ,player_type ,stats ,year ,comparison_mode =None ):
     column_names =get_column_names (cursor ,player_type )
 
@@ -389,7 +437,7 @@ def render_player (cursor ,matches ,player_type ,stats ,year ,comparison_mode =N
             click .echo (f"Error: Invalid year format '{year}'. Use 2022 or 22.")
             return 
 
-        year_col_idx =get_column_index (cursor ,'year')
+        year_col_idx =column_names .index ('year')
         matches =[m for m in matches if m [year_col_idx ]==year_filter ]
 
         if not matches :
@@ -398,16 +446,13 @@ def render_player (cursor ,matches ,player_type ,stats ,year ,comparison_mode =N
 
 
     if len (matches )>1 :
-        player_col_idx =get_column_index (cursor ,'player')
+        player_col_idx =column_names .index ('player')
         unique_players =set (match [player_col_idx ]for match in matches )
 
         if len (unique_players )>1 :
             click .echo (f"Error: Multiple {player_type}s found matching:")
 
-            for player in sorted (unique_players ):
-                player_matches =[match for match in matches if match [player_col_idx ]==player ]
-                team_info =get_player_team_info (player_matches ,column_names )
-                click .echo (f"  - {player} ({team_info})")
+            list_matching_players (cursor ,matches ,player_type )
             return 
 
 
@@ -485,7 +530,7 @@ def render_player (cursor ,matches ,player_type ,stats ,year ,comparison_mode =N
                 year_matches =[m for m in matches if dict (zip (column_names ,m )).get ('year')==yr ]
                 if year_matches :
                     player_team =dict (zip (column_names ,year_matches [0 ])).get ('team')
-                    if player_team and '2TM'not in player_team and '3TM'not in player_team :
+                    if player_team and player_team not in MULTI_TEAM_CODES :
                         team_full_name =get_full_team_name (player_team )
                         cursor .execute (f"SELECT * FROM {team_table} WHERE year = ? AND tm = ?",(yr ,team_full_name ))
                     else :
@@ -574,7 +619,7 @@ def render_player (cursor ,matches ,player_type ,stats ,year ,comparison_mode =N
         team =row_data .get ('team','')
         year =row_data .get ('year')
         awards =row_data .get ('awards','')
-        if '2TM'in team or '3TM'in team :
+        if team in MULTI_TEAM_CODES :
             traded_years .add (year )
             if awards and 'AS'in awards :
                 traded_allstar_years .add (year )
@@ -780,7 +825,7 @@ def render_player (cursor ,matches ,player_type ,stats ,year ,comparison_mode =N
         if awards :
             is_award_winner =bool (re .search (r'(MVP-1|CYA-1|ROY-1)(?=[A-Z]|$)',awards ))
         is_all_star =awards and 'AS'in awards 
-        is_2tm_3tm ='2TM'in team or '3TM'in team 
+        is_2tm_3tm =team in MULTI_TEAM_CODES 
         is_traded_allstar_team =not is_2tm_3tm and year in traded_allstar_years 
         is_regular_traded_team =not is_2tm_3tm and year in traded_years and year not in traded_allstar_years 
 
@@ -983,21 +1028,19 @@ def compare_to_team (cursor ,player_name ,stats ,year ):
     if pitcher_matches and hitter_matches :
 
         column_names =get_column_names (cursor ,'pitcher')
-        player_col_idx =column_names .index ('player')
+        id_col_idx =column_names .index ('player_additional')
         first_pitcher =pitcher_matches [0 ]
 
-        if is_ohtani (first_pitcher [player_col_idx ]):
+        if is_ohtani (first_pitcher [id_col_idx ]):
             click .echo ("Error: Ohtani is a two-way player. Team comparison not supported for two-way players.")
             return 
 
 
-        cursor .execute (f"SELECT * FROM pitcher_stats LIMIT 1")
-        pitcher_column_names =[desc [0 ]for desc in cursor .description ]
+        pitcher_column_names =get_column_names (cursor ,'pitcher')
         pitcher_g_idx =pitcher_column_names .index ('g')
         pitcher_total_games =sum (match [pitcher_g_idx ]for match in pitcher_matches if match [pitcher_g_idx ]is not None )
 
-        cursor .execute (f"SELECT * FROM hitter_stats LIMIT 1")
-        hitter_column_names =[desc [0 ]for desc in cursor .description ]
+        hitter_column_names =get_column_names (cursor ,'hitter')
         hitter_g_idx =hitter_column_names .index ('g')
         hitter_total_games =sum (match [hitter_g_idx ]for match in hitter_matches if match [hitter_g_idx ]is not None )
 
@@ -1026,21 +1069,19 @@ def compare_to_league (cursor ,player_name ,stats ,year ):
     if pitcher_matches and hitter_matches :
 
         column_names =get_column_names (cursor ,'pitcher')
-        player_col_idx =column_names .index ('player')
+        id_col_idx =column_names .index ('player_additional')
         first_pitcher =pitcher_matches [0 ]
 
-        if is_ohtani (first_pitcher [player_col_idx ]):
+        if is_ohtani (first_pitcher [id_col_idx ]):
             click .echo ("Error: Ohtani is a two-way player. League comparison not supported for two-way players.")
             return 
 
 
-        cursor .execute (f"SELECT * FROM pitcher_stats LIMIT 1")
-        pitcher_column_names =[desc [0 ]for desc in cursor .description ]
+        pitcher_column_names =get_column_names (cursor ,'pitcher')
         pitcher_g_idx =pitcher_column_names .index ('g')
         pitcher_total_games =sum (match [pitcher_g_idx ]for match in pitcher_matches if match [pitcher_g_idx ]is not None )
 
-        cursor .execute (f"SELECT * FROM hitter_stats LIMIT 1")
-        hitter_column_names =[desc [0 ]for desc in cursor .description ]
+        hitter_column_names =get_column_names (cursor ,'hitter')
         hitter_g_idx =hitter_column_names .index ('g')
         hitter_total_games =sum (match [hitter_g_idx ]for match in hitter_matches if match [hitter_g_idx ]is not None )
 
@@ -1102,28 +1143,21 @@ def compare_players (cursor ,player1_name ,player2_name ,stats ,year ):
         return 
 
 
-    cursor .execute (f"SELECT * FROM {player1_type}_stats LIMIT 1")
-    column_names =[desc [0 ]for desc in cursor .description ]
+    column_names =get_column_names (cursor ,player1_type )
 
 
     player_col_idx =column_names .index ('player')
     unique_players1 =set (match [player_col_idx ]for match in player1_matches )
     if len (unique_players1 )>1 :
         click .echo (f"Error: Multiple {player1_type}s found matching '{player1_name}':")
-        for player in sorted (unique_players1 ):
-            player_matches =[match for match in player1_matches if match [player_col_idx ]==player ]
-            team_info =get_player_team_info (player_matches ,column_names )
-            click .echo (f"  - {player} ({team_info})")
+        list_matching_players (cursor ,player1_matches ,player1_type )
         return 
 
 
     unique_players2 =set (match [player_col_idx ]for match in player2_matches )
     if len (unique_players2 )>1 :
         click .echo (f"Error: Multiple {player2_type}s found matching '{player2_name}':")
-        for player in sorted (unique_players2 ):
-            player_matches =[match for match in player2_matches if match [player_col_idx ]==player ]
-            team_info =get_player_team_info (player_matches ,column_names )
-            click .echo (f"  - {player} ({team_info})")
+        list_matching_players (cursor ,player2_matches ,player2_type )
         return 
 
 
@@ -1146,7 +1180,7 @@ def compare_players (cursor ,player1_name ,player2_name ,stats ,year ):
 
 
     for entry in player1_year_data :
-        if '2TM'in entry [team_col_idx ]or '3TM'in entry [team_col_idx ]:
+        if entry [team_col_idx ]in MULTI_TEAM_CODES :
             player1_data =entry 
             break 
     if not player1_data :
@@ -1154,7 +1188,7 @@ def compare_players (cursor ,player1_name ,player2_name ,stats ,year ):
 
 
     for entry in player2_year_data :
-        if '2TM'in entry [team_col_idx ]or '3TM'in entry [team_col_idx ]:
+        if entry [team_col_idx ]in MULTI_TEAM_CODES :
             player2_data =entry 
             break 
     if not player2_data :
@@ -1271,21 +1305,19 @@ def display_platoon_splits (cursor ,player_name ,year ,stats ):
     if pitcher_matches and hitter_matches :
 
         column_names =get_column_names (cursor ,'pitcher')
-        player_col_idx =column_names .index ('player')
+        id_col_idx =column_names .index ('player_additional')
         first_pitcher =pitcher_matches [0 ]
 
-        if is_ohtani (first_pitcher [player_col_idx ]):
+        if is_ohtani (first_pitcher [id_col_idx ]):
             click .echo (f"Error: Ohtani is a two-way player. Platoon splits not yet supported for two-way players.")
             return 
 
 
-        cursor .execute (f"SELECT * FROM pitcher_stats LIMIT 1")
-        pitcher_column_names =[desc [0 ]for desc in cursor .description ]
+        pitcher_column_names =get_column_names (cursor ,'pitcher')
         pitcher_g_idx =pitcher_column_names .index ('g')
         pitcher_total_games =sum (match [pitcher_g_idx ]for match in pitcher_matches if match [pitcher_g_idx ]is not None )
 
-        cursor .execute (f"SELECT * FROM hitter_stats LIMIT 1")
-        hitter_column_names =[desc [0 ]for desc in cursor .description ]
+        hitter_column_names =get_column_names (cursor ,'hitter')
         hitter_g_idx =hitter_column_names .index ('g')
         hitter_total_games =sum (match [hitter_g_idx ]for match in hitter_matches if match [hitter_g_idx ]is not None )
 
@@ -1301,8 +1333,7 @@ def display_platoon_splits (cursor ,player_name ,year ,stats ):
         matches =pitcher_matches if pitcher_matches else hitter_matches 
 
 
-    cursor .execute (f"SELECT * FROM {player_type}_stats LIMIT 1")
-    column_names =[desc [0 ]for desc in cursor .description ]
+    column_names =get_column_names (cursor ,player_type )
     player_col_idx =column_names .index ('player')
     unique_players =set (match [player_col_idx ]for match in matches )
 
@@ -1311,7 +1342,7 @@ def display_platoon_splits (cursor ,player_name ,year ,stats ):
         return 
 
     full_name =matches [0 ][player_col_idx ]
-    clean_name =re .sub (r'[*#+]','',full_name ).strip ()
+    clean_name =full_name .translate (NAME_MARKER_TABLE ).strip ()
 
 
     player_info =mlb_api .lookup_player (clean_name )
@@ -1687,8 +1718,7 @@ def handle_versus_matchup (cursor ,player1_name ,player2_name ,year_filter ):
     player2_is_hitter =bool (hitter2_matches )
 
 
-    cursor .execute (f"SELECT * FROM pitcher_stats LIMIT 1")
-    column_names =[desc [0 ]for desc in cursor .description ]
+    column_names =get_column_names (cursor ,'pitcher')
     player_col_idx =column_names .index ('player')
 
     if pitcher1_matches or hitter1_matches :
@@ -1706,7 +1736,7 @@ def handle_versus_matchup (cursor ,player1_name ,player2_name ,year_filter ):
 
     def clean_player_name (name ):
 
-        return re .sub (r'[*#+]','',name ).strip ()
+        return name .translate (NAME_MARKER_TABLE ).strip ()
 
     player1_clean_name =clean_player_name (player1_full_name )
     player2_clean_name =clean_player_name (player2_full_name )
@@ -1943,32 +1973,22 @@ def main (player_name ,stats ,year ,compare ,compare_team ,compare_league ,versu
 
         if platoon :
             display_platoon_splits (cursor ,player_name ,year ,stats )
-            cursor .close ()
-            conn .close ()
             return 
 
         if versus :
             handle_versus_matchup (cursor ,player_name ,versus ,year )
-            cursor .close ()
-            conn .close ()
             return 
 
         if compare :
             compare_players (cursor ,player_name ,compare ,stats ,year )
-            cursor .close ()
-            conn .close ()
             return 
 
         if compare_team :
             compare_to_team (cursor ,player_name ,stats ,year )
-            cursor .close ()
-            conn .close ()
             return 
 
         if compare_league :
             compare_to_league (cursor ,player_name ,stats ,year )
-            cursor .close ()
-            conn .close ()
             return 
 
         pitcher_matches ,hitter_matches =find_player (cursor ,player_name )
@@ -2014,16 +2034,17 @@ def main (player_name ,stats ,year ,compare ,compare_team ,compare_league ,versu
                 return 
 
 
+        p_player ,p_g ,p_id =(get_column_names (cursor ,'pitcher').index (k )for k in ('player','g','player_additional'))
+        h_player ,h_g ,h_id =(get_column_names (cursor ,'hitter').index (k )for k in ('player','g','player_additional'))
+
         pitcher_count =0
         unique_pitchers =set ()
         unique_pitcher_ids =set ()
         if pitcher_matches :
-            cursor .execute (f"SELECT * FROM pitcher_stats LIMIT 1")
-            column_names =[desc [0 ]for desc in cursor .description ]
-            player_col_idx =column_names .index ('player')
-            player_id_idx =column_names .index ('player_additional')
-            unique_pitchers =set (re .sub (r'[*#+]','',match [player_col_idx ]).strip ()for match in pitcher_matches )
-            unique_pitcher_ids =set (match [player_id_idx ]for match in pitcher_matches if match [player_id_idx ])
+            for match in pitcher_matches :
+                unique_pitchers .add (match [p_player ].translate (NAME_MARKER_TABLE ).strip ())
+                if match [p_id ]:
+                    unique_pitcher_ids .add (match [p_id ])
             pitcher_count =len (unique_pitchers )
 
 
@@ -2031,24 +2052,17 @@ def main (player_name ,stats ,year ,compare ,compare_team ,compare_league ,versu
         unique_hitters =set ()
         unique_hitter_ids =set ()
         if hitter_matches :
-            cursor .execute (f"SELECT * FROM hitter_stats LIMIT 1")
-            column_names =[desc [0 ]for desc in cursor .description ]
-            player_col_idx =column_names .index ('player')
-            player_id_idx =column_names .index ('player_additional')
-            unique_hitters =set (re .sub (r'[*#+]','',match [player_col_idx ]).strip ()for match in hitter_matches )
-            unique_hitter_ids =set (match [player_id_idx ]for match in hitter_matches if match [player_id_idx ])
+            for match in hitter_matches :
+                unique_hitters .add (match [h_player ].translate (NAME_MARKER_TABLE ).strip ())
+                if match [h_id ]:
+                    unique_hitter_ids .add (match [h_id ])
             hitter_count =len (unique_hitters ) 
 
 
         same_person =bool (unique_pitcher_ids &unique_hitter_ids )
 
 
-        all_names =list (unique_pitchers )+list (unique_hitters )
-        name_counts ={}
-        for name in all_names :
-            name_counts [name ]=name_counts .get (name ,0 )+1 
-
-        has_exact_duplicates =any (count >1 for count in name_counts .values ())
+        has_exact_duplicates =bool (unique_pitchers &unique_hitters )
 
 
         total_unique_players =len (unique_pitchers |unique_hitters )
@@ -2059,24 +2073,10 @@ def main (player_name ,stats ,year ,compare ,compare_team ,compare_league ,versu
             choices =[]
 
             if pitcher_matches :
-                cursor .execute (f"SELECT * FROM pitcher_stats LIMIT 1")
-                column_names =[desc [0 ]for desc in cursor .description ]
-                player_col_idx =column_names .index ('player')
-
-                for player in sorted (unique_pitchers ):
-                    player_matches_filtered =[match for match in pitcher_matches if re .sub (r'[*#+]','',match [player_col_idx ]).strip ()==player ]
-                    team_str =get_player_team_info (player_matches_filtered ,column_names )
-                    choices .append ((player ,'pitcher',team_str ,player_matches_filtered ))
+                choices .extend (build_player_choices (cursor ,pitcher_matches ,'pitcher'))
 
             if hitter_matches :
-                cursor .execute (f"SELECT * FROM hitter_stats LIMIT 1")
-                column_names =[desc [0 ]for desc in cursor .description ]
-                player_col_idx =column_names .index ('player')
-
-                for player in sorted (unique_hitters ):
-                    player_matches_filtered =[match for match in hitter_matches if re .sub (r'[*#+]','',match [player_col_idx ]).strip ()==player ]
-                    team_str =get_player_team_info (player_matches_filtered ,column_names )
-                    choices .append ((player ,'hitter',team_str ,player_matches_filtered ))
+                choices .extend (build_player_choices (cursor ,hitter_matches ,'hitter'))
 
 
             click .echo ()
@@ -2120,11 +2120,9 @@ def main (player_name ,stats ,year ,compare ,compare_team ,compare_league ,versu
 
         if pitcher_matches and hitter_matches :
 
-            column_names =get_column_names (cursor ,'pitcher')
-            player_col_idx =column_names .index ('player')
             first_pitcher =pitcher_matches [0 ]
 
-            if is_ohtani (first_pitcher [player_col_idx ]):
+            if is_ohtani (first_pitcher [p_id ]):
 
                 if stats :
                     show_pitcher =False 
@@ -2141,6 +2139,9 @@ def main (player_name ,stats ,year ,compare ,compare_team ,compare_league ,versu
                             show_pitcher =True 
                             show_hitter =True 
 
+                        if show_pitcher and show_hitter :
+                            break 
+
                     if show_pitcher :
                         render_player (cursor ,pitcher_matches ,'pitcher',stats ,year )
                     if show_hitter :
@@ -2151,15 +2152,8 @@ def main (player_name ,stats ,year ,compare ,compare_team ,compare_league ,versu
                     render_player (cursor ,hitter_matches ,'hitter',stats ,year )
             else :
 
-                cursor .execute (f"SELECT * FROM pitcher_stats LIMIT 1")
-                pitcher_column_names =[desc [0 ]for desc in cursor .description ]
-                pitcher_g_idx =pitcher_column_names .index ('g')
-                pitcher_total_games =sum (match [pitcher_g_idx ]for match in pitcher_matches if match [pitcher_g_idx ]is not None )
-
-                cursor .execute (f"SELECT * FROM hitter_stats LIMIT 1")
-                hitter_column_names =[desc [0 ]for desc in cursor .description ]
-                hitter_g_idx =hitter_column_names .index ('g')
-                hitter_total_games =sum (match [hitter_g_idx ]for match in hitter_matches if match [hitter_g_idx ]is not None )
+                pitcher_total_games =sum (match [p_g ]for match in pitcher_matches if match [p_g ]is not None )
+                hitter_total_games =sum (match [h_g ]for match in hitter_matches if match [h_g ]is not None )
 
 
                 if pitcher_total_games >=hitter_total_games :
@@ -2171,9 +2165,6 @@ def main (player_name ,stats ,year ,compare ,compare_team ,compare_league ,versu
         else :
             render_player (cursor ,hitter_matches ,'hitter',stats ,year )
 
-        cursor .close ()
-        conn .close ()
-
     except sqlite3 .Error as e :
         click .echo (f"Database error: {e}")
     except Exception as e :
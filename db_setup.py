@@ -3,6 +3,16 @@ import os
 
 DB_PATH = os.path.join(os.path.dirname(__file__), 'baseball_stats.db')
 
+# Sort key for cached matchups, shared by the index below and mlb_api.MATCHUP_SELECT_SQL;
+# SQLite only uses the index when the ORDER BY repeats this expression exactly
+MATCHUP_YEAR_ORDER = "CASE WHEN year = 'career' THEN 9999 ELSE CAST(year AS INTEGER) END"
+
+MATCHUP_YEAR_INDEX_SQL = f'''
+    CREATE INDEX IF NOT EXISTS idx_matchup_year_order ON batter_pitcher_matchups (
+        batter_name, pitcher_name, ({MATCHUP_YEAR_ORDER})
+    )
+'''
+
 def create_tables():
     conn = sqlite3.connect(DB_PATH)
     cursor = conn.cursor()
@@ -234,9 +244,10 @@ def create_tables():
         )
     ''')
 
-    cursor.execute('''
-        CREATE INDEX IF NOT EXISTS idx_matchup_lookup ON batter_pitcher_matchups (batter_name, pitcher_name)
-    ''')
+    # Matches the ORDER BY in mlb_api.MATCHUP_SELECT_SQL so cached matchups are read
+    # in year order straight from the index; it also serves plain name lookups
+    cursor.execute('DROP INDEX IF EXISTS idx_matchup_lookup')
+    cursor.execute(MATCHUP_YEAR_INDEX_SQL)
 
     cursor.execute('''
         CREATE TABLE IF NOT EXISTS platoon_splits (
@@ -1,190 +1,169 @@
 import csv
+import io
+import itertools
 import sqlite3
 import os
+from operator import itemgetter
 
 DB_PATH = os.path.join(os.path.dirname(__file__), 'baseball_stats.db')
 
-def clean_value(value):
-    """Convert empty strings to None for proper NULL handling"""
-    return None if value == '' else value
+PITCHER_CSV_HEADERS = ['Rk', 'Player', 'Age', 'Team', 'Lg', 'WAR', 'W', 'L', 'W-L%', 'ERA',
+                       'G', 'GS', 'GF', 'CG', 'SHO', 'SV', 'IP', 'H', 'R', 'ER', 'HR', 'BB',
+                       'IBB', 'SO', 'HBP', 'BK', 'WP', 'BF', 'ERA+', 'FIP', 'WHIP', 'H9',
+                       'HR9', 'BB9', 'SO9', 'SO/BB', 'Awards', 'Player-additional']
+
+HITTER_CSV_HEADERS = ['Rk', 'Player', 'Age', 'Team', 'Lg', 'WAR', 'G', 'PA', 'AB', 'R', 'H',
+                      '2B', '3B', 'HR', 'RBI', 'SB', 'CS', 'BB', 'SO', 'BA', 'OBP', 'SLG',
+                      'OPS', 'OPS+', 'rOBA', 'Rbat+', 'TB', 'GIDP', 'HBP', 'SH', 'SF', 'IBB',
+                      'Pos', 'Awards', 'Player-additional']
+
+PITCHER_INSERT_SQL = '''
+    INSERT INTO pitcher_stats (
+        year, rk, player, age, team, lg, war, w, l, w_l_pct, era,
+        g, gs, gf, cg, sho, sv, ip, h, r, er, hr, bb, ibb, so,
+        hbp, bk, wp, bf, era_plus, fip, whip, h9, hr9, bb9, so9,
+        so_bb, awards, player_additional
+    ) VALUES (
+        ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?,
+        ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?,
+        ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?,
+        ?, ?, ?
+    )
+'''
+
+HITTER_INSERT_SQL = '''
+    INSERT INTO hitter_stats (
+        year, rk, player, age, team, lg, war, g, pa, ab, r, h,
+        doubles, triples, hr, rbi, sb, cs, bb, so, ba, obp, slg, ops,
+        ops_plus, roba, rbat_plus, tb, gidp, hbp, sh, sf, ibb, pos,
+        awards, player_additional
+    ) VALUES (
+        ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?,
+        ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?,
+        ?, ?, ?, ?, ?, ?, ?, ?, ?, ?,
+        ?, ?
+    )
+'''
+
+# journal_mode is set on every open, not once per process, because close_db()
+# switches the file back to DELETE when each load finishes
+CONNECTION_PRAGMAS = '''
+    PRAGMA journal_mode=WAL;
+    PRAGMA synchronous=NORMAL;
+    PRAGMA temp_store=MEMORY;
+    PRAGMA cache_size=-65536;
+    PRAGMA mmap_size=268435456;
+    PRAGMA cache_spill=0;
+'''
+
+def open_db():
+    """Open the stats database tuned for bulk loading
+
+    Autocommit mode is used so each loader manages its own transaction.
+    Close the connection with close_db() so the file is left out of WAL mode.
+    """
+    conn = sqlite3.connect(DB_PATH, isolation_level=None)
+    conn.executescript(CONNECTION_PRAGMAS)
+    return conn
+
+def close_db(conn):
+    """Switch the database back to a rollback journal and close it
+
+    journal_mode is stored in the database file, and a WAL database cannot be
+    read from a read-only location, so the shipped file must not stay in WAL.
+    """
+    conn.execute('PRAGMA journal_mode=DELETE')
+    conn.close()
+
+def read_csv_file(csv_file, headers):
+    """Read csv_file in a single call and return its rows from read_csv_rows()"""
+    with open(csv_file, 'r', encoding='utf-8') as f:
+        # Wrapped in StringIO rather than split with str.splitlines(), which also
+        # breaks on Unicode separators and inside quoted fields
+        lines = io.StringIO(f.read(), newline='')
+
+    return read_csv_rows(lines, headers)
+
+def read_csv_rows(lines, headers):
+    """Yield each CSV row as a list of values ordered like headers
+
+    Empty values are converted to None for proper NULL handling, and short
+    rows are padded so their missing cells are None as well. The first row
+    is treated as data if it starts with a digit (a headerless export),
+    otherwise as the header line.
+    """
+    reader = csv.reader(lines)
+    first_row = next(reader, None)
+    if first_row is None:
+        return
+
+    if first_row and first_row[0].strip()[:1].isdigit():
+        positions = range(len(headers))
+        reader = itertools.chain([first_row], reader)
+    else:
+        positions = [first_row.index(header) for header in headers]
+
+    get_values = itemgetter(*positions)
+    width = max(positions) + 1
+
+    for row_data in reader:
+        if row_data:
+            if len(row_data) < width:
+                row_data += [''] * (width - len(row_data))
+            yield [value or None for value in get_values(row_data)]
 
 def load_pitcher_csv(csv_file, year, conn, cursor):
+    cursor.execute('BEGIN')
     cursor.execute('DELETE FROM pitcher_stats WHERE year = ?', (year,))
     print(f"Loading pitcher data for year {year}...")
 
-    headers = ['Rk', 'Player', 'Age', 'Team', 'Lg', 'WAR', 'W', 'L', 'W-L%', 'ERA',
-               'G', 'GS', 'GF', 'CG', 'SHO', 'SV', 'IP', 'H', 'R', 'ER', 'HR', 'BB',
-               'IBB', 'SO', 'HBP', 'BK', 'WP', 'BF', 'ERA+', 'FIP', 'WHIP', 'H9',
-               'HR9', 'BB9', 'SO9', 'SO/BB', 'Awards', 'Player-additional']
-
-    with open(csv_file, 'r', encoding='utf-8') as f:
-        first_line = f.readline().strip()
-        f.seek(0)
+    rows = read_csv_file(csv_file, PITCHER_CSV_HEADERS)
 
-        if first_line and first_line[0].isdigit():
-            reader = csv.reader(f)
-        else:
-            reader = csv.DictReader(f)
-            headers = None
-
-        for row_data in reader:
-            if headers:
-                row = dict(zip(headers, row_data))
-            else:
-                row = row_data
-
-            cursor.execute('''
-                INSERT INTO pitcher_stats (
-                    year, rk, player, age, team, lg, war, w, l, w_l_pct, era,
-                    g, gs, gf, cg, sho, sv, ip, h, r, er, hr, bb, ibb, so,
-                    hbp, bk, wp, bf, era_plus, fip, whip, h9, hr9, bb9, so9,
-                    so_bb, awards, player_additional
-                ) VALUES (
-                    ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?,
-                    ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?,
-                    ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?,
-                    ?, ?, ?
-                )
-            ''', (
-                year,
-                clean_value(row['Rk']),
-                clean_value(row['Player']),
-                clean_value(row['Age']),
-                clean_value(row['Team']),
-                clean_value(row['Lg']),
-                clean_value(row['WAR']),
-                clean_value(row['W']),
-                clean_value(row['L']),
-                clean_value(row['W-L%']),
-                clean_value(row['ERA']),
-                clean_value(row['G']),
-                clean_value(row['GS']),
-                clean_value(row['GF']),
-                clean_value(row['CG']),
-                clean_value(row['SHO']),
-                clean_value(row['SV']),
-                clean_value(row['IP']),
-                clean_value(row['H']),
-                clean_value(row['R']),
-                clean_value(row['ER']),
-                clean_value(row['HR']),
-                clean_value(row['BB']),
-                clean_value(row['IBB']),
-                clean_value(row['SO']),
-                clean_value(row['HBP']),
-                clean_value(row['BK']),
-                clean_value(row['WP']),
-                clean_value(row['BF']),
-                clean_value(row['ERA+']),
-                clean_value(row['FIP']),
-                clean_value(row['WHIP']),
-                clean_value(row['H9']),
-                clean_value(row['HR9']),
-                clean_value(row['BB9']),
-                clean_value(row['SO9']),
-                clean_value(row['SO/BB']),
-                clean_value(row['Awards']),
-                clean_value(row['Player-additional'])
-            ))
+    cursor.executemany(PITCHER_INSERT_SQL, (
+        (year, *row_data)
+        for row_data in rows
+    ))
 
+    cursor.execute('COMMIT')
     count = cursor.execute('SELECT COUNT(*) FROM pitcher_stats WHERE year = ?', (year,)).fetchone()[0]
     print(f"Loaded {count} pitcher records for {year}")
 
 def load_hitter_csv(csv_file, year, conn, cursor):
+    cursor.execute('BEGIN')
     cursor.execute('DELETE FROM hitter_stats WHERE year = ?', (year,))
     print(f"Loading hitter data for year {year}...")
 
-    headers = ['Rk', 'Player', 'Age', 'Team', 'Lg', 'WAR', 'G', 'PA', 'AB', 'R', 'H',
-               '2B', '3B', 'HR', 'RBI', 'SB', 'CS', 'BB', 'SO', 'BA', 'OBP', 'SLG',
-               'OPS', 'OPS+', 'rOBA', 'Rbat+', 'TB', 'GIDP', 'HBP', 'SH', 'SF', 'IBB',
-               'Pos', 'Awards', 'Player-additional']
+    rows = read_csv_file(csv_file, HITTER_CSV_HEADERS)
 
-    with open(csv_file, 'r', encoding='utf-8') as f:
-        first_line = f.readline().strip()
-        f.seek(0)
-
-        if first_line and first_line[0].isdigit():
-            reader = csv.reader(f)
-        else:
-            reader = csv.DictReader(f)
-            headers = None
-
-        for row_data in reader:
-            if headers:
-                row = dict(zip(headers, row_data))
-            else:
-                row = row_data
-            cursor.execute('''
-                INSERT INTO hitter_stats (
-                    year, rk, player, age, team, lg, war, g, pa, ab, r, h,
-                    doubles, triples, hr, rbi, sb, cs, bb, so, ba, obp, slg, ops,
-                    ops_plus, roba, rbat_plus, tb, gidp, hbp, sh, sf, ibb, pos,
-                    awards, player_additional
-                ) VALUES (
-                    ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?,
-                    ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?,
-                    ?, ?, ?, ?, ?, ?, ?, ?, ?, ?,
-                    ?, ?
-                )
-            ''', (
-                year,
-                clean_value(row['Rk']),
-                clean_value(row['Player']),
-                clean_value(row['Age']),
-                clean_value(row['Team']),
-                clean_value(row['Lg']),
-                clean_value(row['WAR']),
-                clean_value(row['G']),
-                clean_value(row['PA']),
-                clean_value(row['AB']),
-                clean_value(row['R']),
-                clean_value(row['H']),
-                clean_value(row['2B']),
-                clean_value(row['3B']),
-                clean_value(row['HR']),
-                clean_value(row['RBI']),
-                clean_value(row['SB']),
-                clean_value(row['CS']),
-                clean_value(row['BB']),
-                clean_value(row['SO']),
-                clean_value(row['BA']),
-                clean_value(row['OBP']),
-                clean_value(row['SLG']),
-                clean_value(row['OPS']),
-                clean_value(row['OPS+']),
-                clean_value(row['rOBA']),
-                clean_value(row['Rbat+']),
-                clean_value(row['TB']),
-                clean_value(row['GIDP']),
-                clean_value(row['HBP']),
-                clean_value(row['SH']),
-                clean_value(row['SF']),
-                clean_value(row['IBB']),
-                clean_value(row['Pos']),
-                clean_value(row['Awards']),
-                clean_value(row['Player-additional'])
-            ))
+    cursor.executemany(HITTER_INSERT_SQL, (
+        (year, *row_data)
+        for row_data in rows
+    ))
 
+    cursor.execute('COMMIT')
     count = cursor.execute('SELECT COUNT(*) FROM hitter_stats WHERE year = ?', (year,)).fetchone()[0]
     print(f"Loaded {count} hitter records for {year}")
 
 def load_csv_to_db(csv_file, year):
-    conn = sqlite3.connect(DB_PATH)
-    cursor = conn.cursor()
-
-    if 'pitcher' in csv_file.lower():
-        load_pitcher_csv(csv_file, year, conn, cursor)
-    elif 'hitter' in csv_file.lower():
-        load_hitter_csv(csv_file, year, conn, cursor)
-    else:
-        print(f"Error: Could not determine file type from filename '{csv_file}'")
-        print("Filename should contain 'pitcher' or 'hitter'")
-        conn.close()
-        return
-
-    conn.commit()
-    cursor.close()
-    conn.close()
+    conn = open_db()
+    try:
+        cursor = conn.cursor()
+
+        if 'pitcher' in csv_file.lower():
+            load_pitcher_csv(csv_file, year, conn, cursor)
+        elif 'hitter' in csv_file.lower():
+            load_hitter_csv(csv_file, year, conn, cursor)
+        else:
+            print(f"Error: Could not determine file type from filename '{csv_file}'")
+            print("Filename should contain 'pitcher' or 'hitter'")
+            return
+
+        cursor.close()
+    finally:
+        # A failed load must not leave the file in WAL mode
+        if conn.in_transaction:
+            conn.rollback()
+        close_db(conn)
 
 if __name__ == '__main__':
     import sys
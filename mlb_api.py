@@ -1,6 +1,233 @@
+import sqlite3
 import requests
-import statsapi
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from db_setup import MATCHUP_YEAR_ORDER
+
+try:
+    from orjson import loads as json_loads
+except ImportError:
+    from json import loads as json_loads
+
+# Shared session so repeated API calls reuse pooled keep-alive connections
+SESSION = requests.Session()
+SESSION.mount('https://', HTTPAdapter(
+    pool_connections=10,
+    pool_maxsize=20,
+    max_retries=Retry(total=2, backoff_factor=0.2, status_forcelist=(429, 502, 503, 504))
+))
+
+# Upserts one season of a batter/pitcher matchup, keyed on the two names and
+# the year; a cached row is only overwritten once it is over an hour old
+MATCHUP_INSERT_SQL = '''
+    INSERT INTO batter_pitcher_matchups (
+        batter_name, batter_mlb_id, pitcher_name, pitcher_mlb_id, year,
+        games, pa, ab, h, doubles, triples, hr, rbi,
+        bb, so, hbp, ibb, ba, obp, slg, ops, last_updated
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
+    ON CONFLICT (batter_name, pitcher_name, year) DO UPDATE SET
+        batter_mlb_id = excluded.batter_mlb_id, pitcher_mlb_id = excluded.pitcher_mlb_id,
+        games = excluded.games, pa = excluded.pa, ab = excluded.ab, h = excluded.h,
+        doubles = excluded.doubles, triples = excluded.triples, hr = excluded.hr,
+        rbi = excluded.rbi, bb = excluded.bb, so = excluded.so, hbp = excluded.hbp,
+        ibb = excluded.ibb, ba = excluded.ba, obp = excluded.obp, slg = excluded.slg,
+        ops = excluded.ops, last_updated = CURRENT_TIMESTAMP
+    WHERE batter_pitcher_matchups.last_updated < datetime('now', '-1 hour')
+'''
+
+# Ordered by the same expression as idx_matchup_year_order, which bcli creates
+# when it opens the database, so rows can be read in index order
+MATCHUP_SELECT_SQL = f'''
+    SELECT year, games, pa, ab, h, doubles, triples, hr, rbi,
+           bb, so, hbp, ibb, ba, obp, slg, ops
+    FROM batter_pitcher_matchups
+    WHERE batter_name = ? AND pitcher_name = ?
+    ORDER BY {MATCHUP_YEAR_ORDER}
+'''
+
+# Upserts one side of a player's split, keyed on name, year and split_type,
+# with the same one-hour freshness check as MATCHUP_INSERT_SQL
+PLATOON_INSERT_SQL = '''
+    INSERT INTO platoon_splits (
+        player_name, player_mlb_id, player_type, year, split_type,
+        pa, ab, h, doubles, triples, hr, rbi, bb, so,
+        ba, obp, slg, ops, ip, whip, era, k9, bb9, last_updated
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
+    ON CONFLICT (player_name, year, split_type) DO UPDATE SET
+        player_mlb_id = excluded.player_mlb_id, player_type = excluded.player_type,
+        pa = excluded.pa, ab = excluded.ab, h = excluded.h, doubles = excluded.doubles,
+        triples = excluded.triples, hr = excluded.hr, rbi = excluded.rbi,
+        bb = excluded.bb, so = excluded.so, ba = excluded.ba, obp = excluded.obp,
+        slg = excluded.slg, ops = excluded.ops, ip = excluded.ip, whip = excluded.whip,
+        era = excluded.era, k9 = excluded.k9, bb9 = excluded.bb9,
+        last_updated = CURRENT_TIMESTAMP
+    WHERE platoon_splits.last_updated < datetime('now', '-1 hour')
+'''
+
+# Stat columns of PLATOON_INSERT_SQL in order, with the value used when a split lacks one
+PLATOON_STAT_DEFAULTS = (
+    ('pa', 0), ('ab', 0), ('h', 0), ('doubles', 0), ('triples', 0), ('hr', 0),
+    ('rbi', 0), ('bb', 0), ('so', 0), ('ba', 0.0), ('obp', 0.0), ('slg', 0.0),
+    ('ops', 0.0), ('ip', '0'), ('whip', 0.0), ('era', 0.0), ('k9', 0.0), ('bb9', 0.0),
+)
+
+PLATOON_SELECT_SQL = '''
+    SELECT split_type, pa, ab, h, doubles, triples, hr, rbi, bb, so,
+           ba, obp, slg, ops, ip, whip, era, k9, bb9
+    FROM platoon_splits
+    WHERE player_name = ? AND year = ?
+'''
+
+# Every cached season in one query; rows are grouped by year afterwards
+PLATOON_YEARS_SELECT_SQL = '''
+    SELECT split_type, pa, ab, h, doubles, triples, hr, rbi, bb, so,
+           ba, obp, slg, ops, ip, whip, era, k9, bb9, year
+    FROM platoon_splits
+    WHERE player_name = ? AND year IN ('2022', '2023', '2024', '2025')
+'''
+
+def parse_avg_stat(value):
+    """Parse a rate stat the API returns as a string like ".364" or "1.000"
+
+    Missing values and the API's '-.--' placeholder parse as 0.0.
+    """
+    if not value or value == '-.--':
+        return 0.0
+    try:
+        # float() accepts a bare leading period, so ".364" needs no padding
+        return float(value)
+    except (ValueError, TypeError):
+        return 0.0
+
+# Field maps from API stat keys to our database fields, as
+# (field, API key, default value or parser applied to the raw value)
+MATCHUP_FIELDS = (
+    ('games', 'gamesPlayed', 0),
+    ('pa', 'plateAppearances', 0),
+    ('ab', 'atBats', 0),
+    ('h', 'hits', 0),
+    ('doubles', 'doubles', 0),
+    ('triples', 'triples', 0),
+    ('hr', 'homeRuns', 0),
+    ('rbi', 'rbi', 0),
+    ('bb', 'baseOnBalls', 0),
+    ('so', 'strikeOuts', 0),
+    ('hbp', 'hitByPitch', 0),
+    ('ibb', 'intentionalWalks', 0),
+    ('ba', 'avg', parse_avg_stat),
+    ('obp', 'obp', parse_avg_stat),
+    ('slg', 'slg', parse_avg_stat),
+    ('ops', 'ops', parse_avg_stat),
+)
+
+PITCHER_SPLIT_FIELDS = (
+    ('pa', 'battersFaced', 0),
+    ('ab', 'atBats', 0),
+    ('h', 'hits', 0),
+    ('doubles', 'doubles', 0),
+    ('triples', 'triples', 0),
+    ('hr', 'homeRuns', 0),
+    ('bb', 'baseOnBalls', 0),
+    ('so', 'strikeOuts', 0),
+    ('ba', 'avg', parse_avg_stat),
+    ('obp', 'obp', parse_avg_stat),
+    ('slg', 'slg', parse_avg_stat),
+    ('ops', 'ops', parse_avg_stat),
+    ('ip', 'inningsPitched', '0'),
+    ('whip', 'whip', parse_avg_stat),
+    ('era', 'earnedRunAverage', parse_avg_stat),
+    ('k9', 'strikeoutsPer9Inn', parse_avg_stat),
+    ('bb9', 'walksPer9Inn', parse_avg_stat),
+)
+
+HITTER_SPLIT_FIELDS = (
+    ('pa', 'plateAppearances', 0),
+    ('ab', 'atBats', 0),
+    ('h', 'hits', 0),
+    ('doubles', 'doubles', 0),
+    ('triples', 'triples', 0),
+    ('hr', 'homeRuns', 0),
+    ('rbi', 'rbi', 0),
+    ('bb', 'baseOnBalls', 0),
+    ('so', 'strikeOuts', 0),
+    ('ba', 'avg', parse_avg_stat),
+    ('obp', 'obp', parse_avg_stat),
+    ('slg', 'slg', parse_avg_stat),
+    ('ops', 'ops', parse_avg_stat),
+)
+
+def map_stat_fields(stat, fields):
+    """Build a dict of our fields from an API stat dict using a field map"""
+    return {
+        field: parse(stat.get(api_key)) if callable(parse) else stat.get(api_key, parse)
+        for field, api_key, parse in fields
+    }
+
+# Same player fields statsapi.lookup_player requests and searches through
+PLAYER_LOOKUP_FIELDS = (
+    'people,id,fullName,firstName,lastName,primaryNumber,currentTeam,id,primaryPosition,code,'
+    'abbreviation,useName,boxscoreName,nickName,mlbDebutDate,nameFirstLast,firstLastName,'
+    'lastFirstName,lastInitName,initLastName,fullFMLName,fullLFMName,nameSlug'
+)
+
+@lru_cache(maxsize=1)
+def season_players():
+    """Return every MLB player in the latest season, fetched once per process
+
+    The season is picked like statsapi.latest_season: the first one that has
+    not ended yet, otherwise the most recent. Errors propagate so that a failed
+    fetch is not cached.
+    """
+    response = SESSION.get(
+        'https://statsapi.mlb.com/api/v1/seasons/all', params={'sportId': 1}, timeout=10
+    )
+    response.raise_for_status()
+
+    seasons = json_loads(response.content)['seasons']
+    today = datetime.today().strftime('%Y-%m-%d')
+    latest = next((s for s in seasons if today < s.get('seasonEndDate', '')), seasons[-1])
+
+    response = SESSION.get(
+        'https://statsapi.mlb.com/api/v1/sports/1/players',
+        params={
+            'season': latest.get('seasonId', datetime.now().year),
+            'fields': PLAYER_LOOKUP_FIELDS
+        },
+        timeout=10
+    )
+    response.raise_for_status()
+
+    return json_loads(response.content)['people']
+
+@lru_cache(maxsize=1024)
+def search_player(normalized_name):
+    """Look up a player by lowercased name, caching results for the process
+
+    Matches like statsapi.lookup_player: every word of the name must appear
+    in one of the player's fields. Errors propagate so that failed lookups
+    are not cached.
+    """
+    words = normalized_name.split()
+    players = [
+        player for player in season_players()
+        if all(any(word in str(value).lower() for value in player.values()) for word in words)
+    ]
+    if not players:
+        return None
+
+    # Return the first match
+    player = players[0]
+    position_code = player.get('primaryPosition', {}).get('abbreviation', 'Unknown')
+
+    return {
+        'id': player['id'],
+        'fullName': player['fullName'],
+        'position': position_code
+    }
 
 def lookup_player(name):
     """Look up player by name using MLB Stats API
@@ -10,19 +237,8 @@ def lookup_player(name):
         None if player not found
     """
     try:
-        players = statsapi.lookup_player(name)
-        if not players:
-            return None
-
-        # Return the first match
-        player = players[0]
-        position_code = player.get('primaryPosition', {}).get('abbreviation', 'Unknown')
-
-        return {
-            'id': player['id'],
-            'fullName': player['fullName'],
-            'position': position_code
-        }
+        player = search_player(name.strip().lower())
+        return dict(player) if player else None
     except Exception as e:
         print(f"Error looking up player '{name}': {e}")
         return None
@@ -47,10 +263,10 @@ def fetch_batter_vs_pitcher_stats(batter_id, pitcher_id):
             'group': 'hitting'
         }
 
-        response = requests.get(url, params=params, timeout=10)
+        response = SESSION.get(url, params=params, timeout=10)
         response.raise_for_status()
 
-        data = response.json()
+        data = json_loads(response.content)
 
         if 'stats' not in data or len(data['stats']) == 0:
             return []
@@ -73,37 +289,7 @@ def fetch_batter_vs_pitcher_stats(batter_id, pitcher_id):
                     continue
 
                 # Map API fields to our database fields
-                # Parse batting average stats - API returns them as ".364" or "1.000"
-                def parse_avg_stat(value):
-                    if not value or value == '-.--':
-                        return 0.0
-                    try:
-                        # If starts with period, add leading zero
-                        if value.startswith('.'):
-                            return float('0' + value)
-                        return float(value)
-                    except (ValueError, TypeError):
-                        return 0.0
-
-                matchup_data = {
-                    'year': year,
-                    'games': stat.get('gamesPlayed', 0),
-                    'pa': stat.get('plateAppearances', 0),
-                    'ab': stat.get('atBats', 0),
-                    'h': stat.get('hits', 0),
-                    'doubles': stat.get('doubles', 0),
-                    'triples': stat.get('triples', 0),
-                    'hr': stat.get('homeRuns', 0),
-                    'rbi': stat.get('rbi', 0),
-                    'bb': stat.get('baseOnBalls', 0),
-                    'so': stat.get('strikeOuts', 0),
-                    'hbp': stat.get('hitByPitch', 0),
-                    'ibb': stat.get('intentionalWalks', 0),
-                    'ba': parse_avg_stat(stat.get('avg')),
-                    'obp': parse_avg_stat(stat.get('obp')),
-                    'slg': parse_avg_stat(stat.get('slg')),
-                    'ops': parse_avg_stat(stat.get('ops')),
-                }
+                matchup_data = {'year': year, **map_stat_fields(stat, MATCHUP_FIELDS)}
 
                 results.append(matchup_data)
 
@@ -128,20 +314,16 @@ def cache_matchup(cursor, batter_name, batter_id, pitcher_name, pitcher_id, stat
         stats_list: List of stat dicts from fetch_batter_vs_pitcher_stats()
     """
     try:
-        for stats in stats_list:
-            cursor.execute('''
-                INSERT OR REPLACE INTO batter_pitcher_matchups (
-                    batter_name, batter_mlb_id, pitcher_name, pitcher_mlb_id, year,
-                    games, pa, ab, h, doubles, triples, hr, rbi,
-                    bb, so, hbp, ibb, ba, obp, slg, ops, last_updated
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
-            ''', (
+        cursor.executemany(MATCHUP_INSERT_SQL, (
+            (
                 batter_name, batter_id, pitcher_name, pitcher_id, stats['year'],
                 stats['games'], stats['pa'], stats['ab'], stats['h'],
                 stats['doubles'], stats['triples'], stats['hr'], stats['rbi'],
                 stats['bb'], stats['so'], stats['hbp'], stats['ibb'],
                 stats['ba'], stats['obp'], stats['slg'], stats['ops']
-            ))
+            )
+            for stats in stats_list
+        ))
 
         cursor.connection.commit()
 
@@ -149,6 +331,15 @@ def cache_matchup(cursor, batter_name, batter_id, pitcher_name, pitcher_id, stat
         print(f"Error caching matchup data: {e}")
         cursor.connection.rollback()
 
+def _row_cursor(cursor):
+    """Return a new cursor on cursor's connection that yields sqlite3.Row
+
+    A separate cursor is used so the caller's cursor keeps returning plain tuples.
+    """
+    row_cursor = cursor.connection.cursor()
+    row_cursor.row_factory = sqlite3.Row
+    return row_cursor
+
 def get_cached_matchup(cursor, batter_name, pitcher_name):
     """Get cached matchup from database
 
@@ -156,42 +347,10 @@ def get_cached_matchup(cursor, batter_name, pitcher_name):
         List of dicts with matchup stats, or empty list if not cached
     """
     try:
-        cursor.execute('''
-            SELECT year, games, pa, ab, h, doubles, triples, hr, rbi,
-                   bb, so, hbp, ibb, ba, obp, slg, ops
-            FROM batter_pitcher_matchups
-            WHERE batter_name = ? AND pitcher_name = ?
-            ORDER BY CASE WHEN year = 'career' THEN 9999 ELSE CAST(year AS INTEGER) END
-        ''', (batter_name, pitcher_name))
+        row_cursor = _row_cursor(cursor)
+        row_cursor.execute(MATCHUP_SELECT_SQL, (batter_name, pitcher_name))
 
-        rows = cursor.fetchall()
-
-        if not rows:
-            return []
-
-        results = []
-        for row in rows:
-            results.append({
-                'year': row[0],
-                'games': row[1],
-                'pa': row[2],
-                'ab': row[3],
-                'h': row[4],
-                'doubles': row[5],
-                'triples': row[6],
-                'hr': row[7],
-                'rbi': row[8],
-                'bb': row[9],
-                'so': row[10],
-                'hbp': row[11],
-                'ibb': row[12],
-                'ba': row[13],
-                'obp': row[14],
-                'slg': row[15],
-                'ops': row[16],
-            })
-
-        return results
+        return [dict(row) for row in row_cursor]
 
     except Exception as e:
         print(f"Error retrieving cached matchup: {e}")
@@ -223,27 +382,31 @@ def fetch_platoon_splits(player_id, player_type, year=None, all_years=False):
         if year and not all_years:
             params['season'] = year
 
-        response = requests.get(url, params=params, timeout=10)
-        response.raise_for_status()
-
-        data = response.json()
-
-        if 'stats' not in data or len(data['stats']) == 0:
-            return None
-
-        splits = data['stats'][0].get('splits', [])
-
-        if not splits:
-            return None
+        # Pitchers: what batters hit against them; hitters: their own performance
+        split_fields = PITCHER_SPLIT_FIELDS if player_type == 'pitcher' else HITTER_SPLIT_FIELDS
 
         if all_years:
-            # Fetch splits for each year (2022-2025)
+            # Fetch splits for each year (2022-2025), with the requests in flight together;
+            # the career request is skipped since its totals are not part of the result
+            seasons = range(2022, 2026)
+            with ThreadPoolExecutor(max_workers=len(seasons)) as executor:
+                year_requests = {
+                    yr: executor.submit(SESSION.get, url, params={**params, 'season': yr}, timeout=10)
+                    for yr in seasons
+                }
+
             years_data = {}
-            for yr in range(2022, 2026):
+            request_errors = []
+            for yr in seasons:
                 try:
-                    year_response = requests.get(url, params={**params, 'season': yr}, timeout=10)
+                    year_response = year_requests[yr].result()
                     year_response.raise_for_status()
-                    year_data = year_response.json()
+                except requests.exceptions.RequestException as e:
+                    request_errors.append(e)
+                    continue
+
+                try:
+                    year_data = json_loads(year_response.content)
 
                     if 'stats' not in year_data or len(year_data['stats']) == 0:
                         continue
@@ -258,53 +421,7 @@ def fetch_platoon_splits(player_id, player_type, year=None, all_years=False):
                         split_code = split.get('split', {}).get('code')
                         stat = split.get('stat', {})
 
-                        # Parse batting average stats
-                        def parse_avg_stat(value):
-                            if not value or value == '-.--':
-                                return 0.0
-                            try:
-                                if value.startswith('.'):
-                                    return float('0' + value)
-                                return float(value)
-                            except (ValueError, TypeError):
-                                return 0.0
-
-                        if player_type == 'pitcher':
-                            split_data = {
-                                'pa': stat.get('battersFaced', 0),
-                                'ab': stat.get('atBats', 0),
-                                'h': stat.get('hits', 0),
-                                'doubles': stat.get('doubles', 0),
-                                'triples': stat.get('triples', 0),
-                                'hr': stat.get('homeRuns', 0),
-                                'bb': stat.get('baseOnBalls', 0),
-                                'so': stat.get('strikeOuts', 0),
-                                'ba': parse_avg_stat(stat.get('avg')),
-                                'obp': parse_avg_stat(stat.get('obp')),
-                                'slg': parse_avg_stat(stat.get('slg')),
-                                'ops': parse_avg_stat(stat.get('ops')),
-                                'ip': stat.get('inningsPitched', '0'),
-                                'whip': parse_avg_stat(stat.get('whip')),
-                                'era': parse_avg_stat(stat.get('earnedRunAverage')),
-                                'k9': parse_avg_stat(stat.get('strikeoutsPer9Inn')),
-                                'bb9': parse_avg_stat(stat.get('walksPer9Inn')),
-                            }
-                        else:
-                            split_data = {
-                                'pa': stat.get('plateAppearances', 0),
-                                'ab': stat.get('atBats', 0),
-                                'h': stat.get('hits', 0),
-                                'doubles': stat.get('doubles', 0),
-                                'triples': stat.get('triples', 0),
-                                'hr': stat.get('homeRuns', 0),
-                                'rbi': stat.get('rbi', 0),
-                                'bb': stat.get('baseOnBalls', 0),
-                                'so': stat.get('strikeOuts', 0),
-                                'ba': parse_avg_stat(stat.get('avg')),
-                                'obp': parse_avg_stat(stat.get('obp')),
-                                'slg': parse_avg_stat(stat.get('slg')),
-                                'ops': parse_avg_stat(stat.get('ops')),
-                            }
+                        split_data = map_stat_fields(stat, split_fields)
 
                         if split_code == 'vl':
                             years_data[yr]['left'] = split_data
@@ -315,6 +432,10 @@ def fetch_platoon_splits(player_id, player_type, year=None, all_years=False):
                     # Skip years with errors
                     continue
 
+            # Only a failure of every request is reported, as the API being unreachable
+            if len(request_errors) == len(seasons):
+                raise request_errors[-1]
+
             # Convert to list format
             result = []
             for yr in sorted(years_data.keys()):
@@ -327,61 +448,26 @@ def fetch_platoon_splits(player_id, player_type, year=None, all_years=False):
 
             return result if result else None
 
+        response = SESSION.get(url, params=params, timeout=10)
+        response.raise_for_status()
+
+        data = json_loads(response.content)
+
+        if 'stats' not in data or len(data['stats']) == 0:
+            return None
+
+        splits = data['stats'][0].get('splits', [])
+
+        if not splits:
+            return None
+
         result = {}
 
         for split in splits:
             split_code = split.get('split', {}).get('code')
             stat = split.get('stat', {})
 
-            # Parse batting average stats
-            def parse_avg_stat(value):
-                if not value or value == '-.--':
-                    return 0.0
-                try:
-                    if value.startswith('.'):
-                        return float('0' + value)
-                    return float(value)
-                except (ValueError, TypeError):
-                    return 0.0
-
-            if player_type == 'pitcher':
-                # For pitchers: what batters hit against them
-                split_data = {
-                    'pa': stat.get('battersFaced', 0),
-                    'ab': stat.get('atBats', 0),
-                    'h': stat.get('hits', 0),
-                    'doubles': stat.get('doubles', 0),
-                    'triples': stat.get('triples', 0),
-                    'hr': stat.get('homeRuns', 0),
-                    'bb': stat.get('baseOnBalls', 0),
-                    'so': stat.get('strikeOuts', 0),
-                    'ba': parse_avg_stat(stat.get('avg')),
-                    'obp': parse_avg_stat(stat.get('obp')),
-                    'slg': parse_avg_stat(stat.get('slg')),
-                    'ops': parse_avg_stat(stat.get('ops')),
-                    'ip': stat.get('inningsPitched', '0'),
-                    'whip': parse_avg_stat(stat.get('whip')),
-                    'era': parse_avg_stat(stat.get('earnedRunAverage')),
-                    'k9': parse_avg_stat(stat.get('strikeoutsPer9Inn')),
-                    'bb9': parse_avg_stat(stat.get('walksPer9Inn')),
-                }
-            else:
-                # For hitters: their performance
-                split_data = {
-                    'pa': stat.get('plateAppearances', 0),
-                    'ab': stat.get('atBats', 0),
-                    'h': stat.get('hits', 0),
-                    'doubles': stat.get('doubles', 0),
-                    'triples': stat.get('triples', 0),
-                    'hr': stat.get('homeRuns', 0),
-                    'rbi': stat.get('rbi', 0),
-                    'bb': stat.get('baseOnBalls', 0),
-                    'so': stat.get('strikeOuts', 0),
-                    'ba': parse_avg_stat(stat.get('avg')),
-                    'obp': parse_avg_stat(stat.get('obp')),
-                    'slg': parse_avg_stat(stat.get('slg')),
-                    'ops': parse_avg_stat(stat.get('ops')),
-                }
+            split_data = map_stat_fields(stat, split_fields)
 
             if split_code == 'vl':
                 result['left'] = split_data
@@ -412,83 +498,20 @@ def cache_platoon_splits(cursor, player_name, player_id, player_type, splits_dat
     try:
         if all_years:
             # Cache multiple years
-            for year_data in splits_data:
-                yr = str(year_data['year'])
-
-                # Cache left split
-                left_stat = year_data['left']
-                cursor.execute('''
-                    INSERT OR REPLACE INTO platoon_splits (
-                        player_name, player_mlb_id, player_type, year, split_type,
-                        pa, ab, h, doubles, triples, hr, rbi, bb, so,
-                        ba, obp, slg, ops, ip, whip, era, k9, bb9, last_updated
-                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
-                ''', (
-                    player_name, player_id, player_type, yr, 'left',
-                    left_stat.get('pa', 0), left_stat.get('ab', 0), left_stat.get('h', 0),
-                    left_stat.get('doubles', 0), left_stat.get('triples', 0), left_stat.get('hr', 0),
-                    left_stat.get('rbi', 0), left_stat.get('bb', 0), left_stat.get('so', 0),
-                    left_stat.get('ba', 0.0), left_stat.get('obp', 0.0), left_stat.get('slg', 0.0),
-                    left_stat.get('ops', 0.0), left_stat.get('ip', '0'), left_stat.get('whip', 0.0),
-                    left_stat.get('era', 0.0), left_stat.get('k9', 0.0), left_stat.get('bb9', 0.0)
-                ))
-
-                # Cache right split
-                right_stat = year_data['right']
-                cursor.execute('''
-                    INSERT OR REPLACE INTO platoon_splits (
-                        player_name, player_mlb_id, player_type, year, split_type,
-                        pa, ab, h, doubles, triples, hr, rbi, bb, so,
-                        ba, obp, slg, ops, ip, whip, era, k9, bb9, last_updated
-                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
-                ''', (
-                    player_name, player_id, player_type, yr, 'right',
-                    right_stat.get('pa', 0), right_stat.get('ab', 0), right_stat.get('h', 0),
-                    right_stat.get('doubles', 0), right_stat.get('triples', 0), right_stat.get('hr', 0),
-                    right_stat.get('rbi', 0), right_stat.get('bb', 0), right_stat.get('so', 0),
-                    right_stat.get('ba', 0.0), right_stat.get('obp', 0.0), right_stat.get('slg', 0.0),
-                    right_stat.get('ops', 0.0), right_stat.get('ip', '0'), right_stat.get('whip', 0.0),
-                    right_stat.get('era', 0.0), right_stat.get('k9', 0.0), right_stat.get('bb9', 0.0)
-                ))
+            year_splits = [(str(year_data['year']), year_data) for year_data in splits_data]
         else:
             # Cache single year or career
-            yr = str(year) if year else 'career'
+            year_splits = [(str(year) if year else 'career', splits_data)]
+
+        # Both splits for every year are written in one batch
+        rows = [
+            (player_name, player_id, player_type, yr, side,
+             *(splits[side].get(field, default) for field, default in PLATOON_STAT_DEFAULTS))
+            for yr, splits in year_splits
+            for side in ('left', 'right')
+        ]
 
-            # Cache left split
-            left_stat = splits_data['left']
-            cursor.execute('''
-                INSERT OR REPLACE INTO platoon_splits (
-                    player_name, player_mlb_id, player_type, year, split_type,
-                    pa, ab, h, doubles, triples, hr, rbi, bb, so,
-                    ba, obp, slg, ops, ip, whip, era, k9, bb9, last_updated
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
-            ''', (
-                player_name, player_id, player_type, yr, 'left',
-                left_stat.get('pa', 0), left_stat.get('ab', 0), left_stat.get('h', 0),
-                left_stat.get('doubles', 0), left_stat.get('triples', 0), left_stat.get('hr', 0),
-                left_stat.get('rbi', 0), left_stat.get('bb', 0), left_stat.get('so', 0),
-                left_stat.get('ba', 0.0), left_stat.get('obp', 0.0), left_stat.get('slg', 0.0),
-                left_stat.get('ops', 0.0), left_stat.get('ip', '0'), left_stat.get('whip', 0.0),
-                left_stat.get('era', 0.0), left_stat.get('k9', 0.0), left_stat.get('bb9', 0.0)
-            ))
-
-            # Cache right split
-            right_stat = splits_data['right']
-            cursor.execute('''
-                INSERT OR REPLACE INTO platoon_splits (
-                    player_name, player_mlb_id, player_type, year, split_type,
-                    pa, ab, h, doubles, triples, hr, rbi, bb, so,
-                    ba, obp, slg, ops, ip, whip, era, k9, bb9, last_updated
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
-            ''', (
-                player_name, player_id, player_type, yr, 'right',
-                right_stat.get('pa', 0), right_stat.get('ab', 0), right_stat.get('h', 0),
-                right_stat.get('doubles', 0), right_stat.get('triples', 0), right_stat.get('hr', 0),
-                right_stat.get('rbi', 0), right_stat.get('bb', 0), right_stat.get('so', 0),
-                right_stat.get('ba', 0.0), right_stat.get('obp', 0.0), right_stat.get('slg', 0.0),
-                right_stat.get('ops', 0.0), right_stat.get('ip', '0'), right_stat.get('whip', 0.0),
-                right_stat.get('era', 0.0), right_stat.get('k9', 0.0), right_stat.get('bb9', 0.0)
-            ))
+        cursor.executemany(PLATOON_INSERT_SQL, rows)
 
         cursor.connection.commit()
     except Exception as e:
@@ -504,29 +527,26 @@ def get_cached_platoon_splits(cursor, player_name, year=None, all_years=False):
         None if not cached
     """
     try:
+        row_cursor = _row_cursor(cursor)
+
         if all_years:
-            # Get all years (2022-2025)
+            # Get all years (2022-2025) in one query, then group the rows by year
+            row_cursor.execute(PLATOON_YEARS_SELECT_SQL, (player_name,))
+
+            rows_by_year = {}
+            for row in row_cursor:
+                rows_by_year.setdefault(row['year'], []).append(row)
+
             years_data = []
             for yr in range(2022, 2026):
-                cursor.execute('''
-                    SELECT split_type, pa, ab, h, doubles, triples, hr, rbi, bb, so,
-                           ba, obp, slg, ops, ip, whip, era, k9, bb9
-                    FROM platoon_splits
-                    WHERE player_name = ? AND year = ?
-                ''', (player_name, str(yr)))
-
-                rows = cursor.fetchall()
+                rows = rows_by_year.get(str(yr), [])
                 if len(rows) == 2:  # Must have both left and right
                     year_splits = {'year': yr}
                     for row in rows:
-                        split_data = {
-                            'pa': row[1], 'ab': row[2], 'h': row[3], 'doubles': row[4],
-                            'triples': row[5], 'hr': row[6], 'rbi': row[7], 'bb': row[8],
-                            'so': row[9], 'ba': row[10], 'obp': row[11], 'slg': row[12],
-                            'ops': row[13], 'ip': row[14], 'whip': row[15], 'era': row[16],
-                            'k9': row[17], 'bb9': row[18]
-                        }
-                        if row[0] == 'left':
+                        split_data = dict(row)
+                        split_type = split_data.pop('split_type')
+                        del split_data['year']
+                        if split_type == 'left':
                             year_splits['left'] = split_data
                         else:
                             year_splits['right'] = split_data
@@ -538,27 +558,17 @@ def get_cached_platoon_splits(cursor, player_name, year=None, all_years=False):
         else:
             # Get single year or career
             yr = str(year) if year else 'career'
-            cursor.execute('''
-                SELECT split_type, pa, ab, h, doubles, triples, hr, rbi, bb, so,
-                       ba, obp, slg, ops, ip, whip, era, k9, bb9
-                FROM platoon_splits
-                WHERE player_name = ? AND year = ?
-            ''', (player_name, yr))
-
-            rows = cursor.fetchall()
+            row_cursor.execute(PLATOON_SELECT_SQL, (player_name, yr))
+
+            rows = row_cursor.fetchall()
             if len(rows) != 2:
                 return None
 
             result = {}
             for row in rows:
-                split_data = {
-                    'pa': row[1], 'ab': row[2], 'h': row[3], 'doubles': row[4],
-                    'triples': row[5], 'hr': row[6], 'rbi': row[7], 'bb': row[8],
-                    'so': row[9], 'ba': row[10], 'obp': row[11], 'slg': row[12],
-                    'ops': row[13], 'ip': row[14], 'whip': row[15], 'era': row[16],
-                    'k9': row[17], 'bb9': row[18]
-                }
-                if row[0] == 'left':
+                split_data = dict(row)
+                split_type = split_data.pop('split_type')
+                if split_type == 'left':
                     result['left'] = split_data
                 else:
                     result['right'] = split_data